@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from pathlib import Path
 
 # @st.cache_data   ← Comentado para evitar errores en Jupyter Notebook
@@ -9,7 +10,9 @@ def load_data(filepath):
     Carga CSV histórico de Solana
     Cachea el resultado para eficiencia (solo en app Streamlit)
     """
-    df = pd.read_csv(filepath)
+    # El lector de pyarrow parsea en paralelo y produce los mismos dtypes
+    # (float64/int64) que el motor C; 'Open time' se convierte a continuación
+    df = pd.read_csv(filepath, engine='pyarrow')
     df['Open time'] = pd.to_datetime(df['Open time'])
     df.sort_values('Open time', inplace=True)
     return df
@@ -20,28 +23,51 @@ def get_date_range(df, period=30, year=None):
     else:
         return df.tail(period).reset_index(drop=True)
 
+def _rolling_mean(values, window):
+    """Media móvil con NaN en las primeras window-1 posiciones (como pandas)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+def _rolling_std(values, window):
+    """Desviación típica móvil muestral (ddof=1, como pandas)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return out
+
 def prepare_features(df, window=20):
-    features_df = df[['Open time', 'Open', 'High', 'Low', 'Close', 'Volume', 'Number of trades']].copy()  # ← Incluye 'Number of trades'
+    # Se trabaja sobre arrays numpy y se construye el DataFrame una sola vez,
+    # en lugar de crear una Series de pandas por cada indicador
+    base_cols = ['Open time', 'Open', 'High', 'Low', 'Close', 'Volume', 'Number of trades']  # ← Incluye 'Number of trades'
+    features = {col: df[col].to_numpy() for col in base_cols}
+    close = features['Close'].astype(np.float64, copy=False)
+    volume = features['Volume'].astype(np.float64, copy=False)
     
     # Retornos
-    features_df['Returns'] = features_df['Close'].pct_change()
+    returns = np.full(len(close), np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    features['Returns'] = returns
     
     # Medias móviles
-    features_df['SMA20'] = features_df['Close'].rolling(window=20).mean()
-    features_df['SMA50'] = features_df['Close'].rolling(window=50).mean()
+    features['SMA20'] = _rolling_mean(close, 20)
+    features['SMA50'] = _rolling_mean(close, 50)
     
     # Volatilidad
-    features_df['Volatility_20'] = features_df['Returns'].rolling(window=window).std()  # ← Renombrado a Volatility_20
+    features['Volatility_20'] = _rolling_std(returns, window)  # ← Renombrado a Volatility_20
     
     # High-Low Range
-    features_df['HL_Range'] = (features_df['High'] - features_df['Low']) / features_df['Close']
+    features['HL_Range'] = (features['High'] - features['Low']) / close
     
     # Volume normalized
-    features_df['Volume_MA'] = features_df['Volume'].rolling(window=20).mean()
-    features_df['Volume_Norm'] = features_df['Volume'] / features_df['Volume_MA']
+    features['Volume_MA'] = _rolling_mean(volume, 20)
+    features['Volume_Norm'] = volume / features['Volume_MA']
     
     # Targets del entrenamiento
-    features_df['Target_Price'] = features_df['Close'].shift(-1)
-    features_df['Target_Direction'] = np.where(features_df['Target_Price'] > features_df['Close'], 1, 0)
+    target_price = np.full(len(close), np.nan)
+    target_price[:-1] = close[1:]
+    features['Target_Price'] = target_price
+    features['Target_Direction'] = np.where(target_price > close, 1, 0)
     
-    return features_df.dropna()
\ No newline at end of file
+    return pd.DataFrame(features, index=df.index).dropna()
@@ -1,36 +1,43 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
 
 def calculate_rsi(closes, period=14):
-    """RSI - Relative Strength Index"""
+    """RSI - Relative Strength Index (suavizado de Wilder, vectorizado)"""
+    closes = np.asarray(closes, dtype=np.float64)
+    rsi = np.full(len(closes), np.nan)
+    if len(closes) <= period:
+        return rsi
+    
     deltas = np.diff(closes)
     gains = np.where(deltas > 0, deltas, 0)
     losses = np.where(deltas < 0, -deltas, 0)
     
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
+    # avg[t] = (avg[t-1] * (period - 1) + x[t]) / period es un filtro IIR de
+    # primer orden: lfilter lo resuelve en C en una sola pasada
+    b, a = [1 / period], [1, -(period - 1) / period]
+    
+    def wilder(values):
+        seed = np.mean(values[:period])
+        smoothed, _ = lfilter(b, a, values[period:], zi=[-a[1] * seed])
+        return np.concatenate(([seed], smoothed))
     
-    rsi = [None] * period
+    avg_gain = wilder(gains)
+    avg_loss = wilder(losses)
     
-    for i in range(period, len(closes)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        
-        if avg_loss == 0:
-            rsi_value = 100 if avg_gain > 0 else 0
-        else:
-            rs = avg_gain / avg_loss
-            rsi_value = 100 - (100 / (1 + rs))
-        
-        rsi.append(rsi_value)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi_values = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi[period:] = np.where(avg_loss == 0, np.where(avg_gain > 0, 100, 0), rsi_values)
     
-    return np.array(rsi)
+    return rsi
 
 def calculate_sma(prices, period=20):
     """SMA - Simple Moving Average"""
-    sma = [None] * (period - 1)
-    for i in range(period - 1, len(prices)):
-        sma.append(np.mean(prices[i-period+1:i+1]))
-    return np.array(sma)
+    prices = np.asarray(prices, dtype=np.float64)
+    sma = np.full(len(prices), np.nan)
+    if len(prices) >= period:
+        sma[period - 1:] = sliding_window_view(prices, period).mean(axis=1)
+    return sma
 
 def calculate_ema(prices, period=20):
     """EMA - Exponential Moving Average"""
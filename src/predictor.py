@@ -1,16 +1,83 @@
+import os
 import pickle
-import tensorflow as tf
 import numpy as np
-from sklearn.preprocessing import StandardScaler
+
+try:
+    import onnxruntime as ort
+except ImportError:  # ONNX Runtime es opcional
+    ort = None
+
+# Longitud de la secuencia de entrada del LSTM
+SEQ_LEN = 20
+
+# Modelos ya deserializados por directorio; el módulo sigue importado entre
+# re-ejecuciones de Streamlit/celdas del notebook, así que se cargan una vez
+_MODEL_CACHE = {}
+
+class OnnxRegressor:
+    """
+    Random Forest exportado a ONNX con la misma interfaz predict() que sklearn
+    """
+    def __init__(self, path):
+        self.session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.n_features_in_ = model_input.shape[1]
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        return self.session.run(None, {self.input_name: X})[0].ravel()
+
+def export_rf_onnx(rf_model, model_dir):
+    """
+    Convierte el Random Forest a ONNX (una sola vez, tras entrenar)
+    Requiere skl2onnx; load_models usará models/rf_model.onnx si existe
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    initial_types = [('X', FloatTensorType([None, rf_model.n_features_in_]))]
+    onx = convert_sklearn(rf_model, initial_types=initial_types)
+    with open(f'{model_dir}/rf_model.onnx', 'wb') as f:
+        f.write(onx.SerializeToString())
+
+def _load_pickle(path):
+    """Lee un pickle con buffer de 1 MiB (los árboles son arrays grandes)"""
+    with open(path, 'rb', buffering=1 << 20) as f:
+        return pickle.load(f)
+
+def _warm_up(rf_model, lstm_model):
+    """
+    Predicción en vacío al cargar: la primera llamada compila el grafo de
+    TensorFlow del LSTM y reserva los buffers internos de sklearn/ONNX Runtime,
+    así la primera predicción real no paga ese coste
+    """
+    rf_model.predict(np.zeros((1, rf_model.n_features_in_), dtype=np.float32))
+    lstm_model.predict(np.zeros((1,) + tuple(lstm_model.input_shape[1:])), verbose=0)
 
 def load_models(model_dir):
     """
     Carga modelos pre-entrenados
+    Si hay rf_model.onnx y onnxruntime instalado, sirve el Random Forest con ONNX
+    Cachea los modelos por directorio para no releerlos de disco
     """
+    if model_dir in _MODEL_CACHE:
+        return _MODEL_CACHE[model_dir]
     try:
-        rf_model = pickle.load(open(f'{model_dir}/rf_model.pkl', 'rb'))
+        onnx_path = f'{model_dir}/rf_model.onnx'
+        if ort is not None and os.path.exists(onnx_path):
+            rf_model = OnnxRegressor(onnx_path)
+        else:
+            rf_model = _load_pickle(f'{model_dir}/rf_model.pkl')
+            # Se entrenó con n_jobs=-1; para predecir pocas filas el reparto con
+            # joblib cuesta más que recorrer los árboles
+            rf_model.n_jobs = 1
+        # TensorFlow tarda segundos en importarse: solo se paga al cargar el LSTM
+        import tensorflow as tf
         lstm_model = tf.keras.models.load_model(f'{model_dir}/lstm_model.h5')
-        scaler = pickle.load(open(f'{model_dir}/scaler.pkl', 'rb'))
+        scaler = _load_pickle(f'{model_dir}/scaler.pkl')
+        _warm_up(rf_model, lstm_model)
+        _MODEL_CACHE[model_dir] = (rf_model, lstm_model, scaler)
         return rf_model, lstm_model, scaler
     except FileNotFoundError:
         raise Exception("""
@@ -26,38 +93,38 @@ def predict_next_days(rf_model, lstm_model, scaler, features_df, days=14):
     Usa Random Forest + LSTM ensemble
     """
     # Preparar features para predicción
+    # Solo se usan las últimas SEQ_LEN filas: se copian columna a columna en un
+    # buffer numpy en lugar de construir un sub-DataFrame con todo el histórico
     feature_cols = ['Open', 'High', 'Low', 'Close', 'Volume', 'SMA20', 'SMA50', 'Volatility']
-    X_features = features_df[feature_cols].values
+    X_features = np.empty((SEQ_LEN, len(feature_cols)))
+    for j, col in enumerate(feature_cols):
+        X_features[:, j] = features_df[col].to_numpy()[-SEQ_LEN:]
     X_scaled = scaler.transform(X_features)
     
-    # Inicializar predicciones
-    rf_predictions = []
-    lstm_predictions = []
-    
     # Usar último dato como base
     last_features = X_scaled[-1:]
     
     # Simple: usar último valor como predicción constante
     # (En producción, haríamos auto-regresión)
-    for i in range(days):
-        rf_pred = rf_model.predict(last_features)[0]
-        
-        # LSTM requiere secuencia temporal (simplificado)
-        lstm_input = np.reshape(X_scaled[-20:], (1, 20, len(feature_cols)))
-        lstm_pred = lstm_model.predict(lstm_input)[0][0]
-        
-        rf_predictions.append(rf_pred)
-        lstm_predictions.append(lstm_pred)
+    # Se arma un lote con una fila por día y se llama a predict() una sola vez
+    # por modelo, en lugar de pagar el coste fijo de cada llamada N veces
+    # float32 en orden C: es el dtype con el que recorren los árboles sklearn y
+    # ONNX, así predict() no necesita volver a copiar/convertir la entrada
+    rf_batch = np.repeat(last_features.astype(np.float32), days, axis=0)
+    rf_array = rf_model.predict(rf_batch)
+    
+    # LSTM requiere secuencia temporal (simplificado)
+    lstm_input = np.reshape(X_scaled, (1, SEQ_LEN, len(feature_cols)))
+    lstm_batch = np.repeat(lstm_input, days, axis=0)
+    lstm_array = lstm_model.predict(lstm_batch)[:, 0]
     
     # Ensemble
-    rf_array = np.array(rf_predictions)
-    lstm_array = np.array(lstm_predictions)
     ensemble = (rf_array * 0.4 + lstm_array * 0.6)
     
     # Desescalar predicciones
     rf_predictions_orig = scaler.inverse_transform(np.column_stack([
-        np.zeros((len(rf_predictions), len(feature_cols)-1)),
-        rf_predictions
+        np.zeros((days, len(feature_cols)-1)),
+        rf_array
     ]))[:, -1]
     
     return {